@@ -1,11 +1,30 @@
+import asyncio
 import requests
 import json
 import logging
 import os
+import time
+import uuid
 import xml.etree.ElementTree as ET
-import requests 
 from requests_kerberos import HTTPKerberosAuth
 import boto3
+from cmlbootstrap.singleflight import SingleFlight
+from cmlbootstrap import projection
+from cmlbootstrap.runtimes import RuntimeCatalog, DEFAULT_TTL
+from cmlbootstrap.log import PayloadSampler, DEFAULT_PAYLOAD_MAX_CHARS
+
+HEADERS = {"Content-Type": "application/json"}
+
+logger = logging.getLogger(__name__)
+
+
+def _new_session(pool_size=32):
+    """Create a session whose connection pool is large enough for threaded callers"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 class CMLBootstrap:
@@ -16,23 +35,161 @@ class CMLBootstrap:
         username (str): Current username.
         api_key (str): API key.
         project_name (str): Project name.
+        log_level (int): Level set on the cmlbootstrap logger, left as configured when None.
+        coalesce_reads (bool): Share one HTTP call between concurrent identical reads.
+        payload_sample_rate (float): Fraction of successful response bodies logged at DEBUG.
+        payload_max_chars (int): Maximum number of characters of a response body written to the log.
     """
 
+    # Shared by all instances so that workers holding their own client still
+    # coalesce identical reads against the same host with the same api key.
+    _single_flight = SingleFlight()
+
     def __init__(
             self, 
             host = os.getenv("CDSW_API_URL").split(":")[0] + "://" + os.getenv("CDSW_DOMAIN"), 
             username = os.getenv("HADOOP_USER_NAME"), 
             api_key= os.getenv("CDSW_API_KEY"), 
             project_name = os.getenv("CDSW_PROJECT"), 
-            log_level=logging.INFO
+            log_level=None,
+            coalesce_reads=True,
+            payload_sample_rate=0.0,
+            payload_max_chars=DEFAULT_PAYLOAD_MAX_CHARS
         ):
         self.host = host
         self.username = username
         self.api_key = api_key
         self.project_name = project_name
-        logging.basicConfig(level=log_level)
+        self.coalesce_reads = coalesce_reads
+        # Pooled connections (gzip/deflate, and br with brotli installed) for
+        # this client only, so cookies set for one api key never reach another.
+        self._session = _new_session()
+        self.payloads = PayloadSampler(payload_sample_rate, payload_max_chars)
+        if log_level is not None:
+            logging.getLogger("cmlbootstrap").setLevel(log_level)
+
+        logger.debug("Api Initiated")
+
+    def _request(self, method, endpoint, params, message, expected_status=200,
+                 parse=True, fields=None, items="item", with_status=False):
+        """Send a request to the api and parse its response
+
+        Every call is logged with structured fields (method, endpoint, status,
+        latency_ms and request_id). Error responses are logged at ERROR with
+        their body capped to payload_max_chars, successful bodies are only
+        logged at DEBUG for a payload_sample_rate fraction of calls.
+
+        Arguments:
+            method {str} -- HTTP method
+            endpoint {str} -- full endpoint url
+            params {dict} -- request body
+            message {str} -- debug message logged on success
+            expected_status {int} -- status code of a successful call
+            parse {bool} -- parse the body of a successful call
+            fields {iterable} -- if given, keep only these fields of each list item
+            items {str} -- location of the list to project, see projection.load_projected
+            with_status {bool} -- also return the response status code
 
-        logging.debug("Api Initiated")
+        Returns:
+            dict -- parsed json response, None if parse is False and the call succeeded.
+                    A (status_code, response) tuple if with_status is True.
+        """
+        request_id = uuid.uuid4().hex
+        headers = dict(HEADERS)
+        headers["X-Request-ID"] = request_id
+        start = time.perf_counter()
+        res = self._session.request(
+            method,
+            endpoint,
+            headers=headers,
+            auth=(self.api_key, ""),
+            data=json.dumps(params),
+            stream=fields is not None
+        )
+        extra = {
+            "method": method,
+            "endpoint": endpoint,
+            "status": res.status_code,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "request_id": res.headers.get("X-Request-ID", request_id),
+        }
+
+        # Streamed (projected) responses hold their connection until closed.
+        with res:
+            if (res.status_code != expected_status):
+                try:
+                    response = res.json()
+                except ValueError:
+                    response = {"message": res.text}
+                logger.error("%s %s returned %s: %s", method, endpoint, res.status_code,
+                             response.get("message") if isinstance(response, dict) else "", extra=extra)
+                self.payloads.log(logger, logging.ERROR, response, extra, always=True)
+            else:
+                if not parse:
+                    response = None
+                elif fields is None:
+                    response = res.json()
+                else:
+                    response = projection.load_projected(res, items, fields)
+                logger.debug(message, extra=extra)
+                self.payloads.log(logger, logging.DEBUG, response, extra)
+
+        if with_status:
+            return res.status_code, response
+        return response
+
+    def _read(self, method, endpoint, params, message, fields=None, items="item"):
+        """Perform a read-only request against the api
+
+        Concurrent calls with the same method, endpoint, params and fields
+        share a single HTTP request and all receive its parsed response.
+
+        Arguments:
+            method {str} -- HTTP method, GET or POST
+            endpoint {str} -- full endpoint url
+            params {dict} -- request parameters
+            message {str} -- debug message logged on success
+            fields {iterable} -- if given, keep only these fields of each list item
+            items {str} -- location of the list to project, see projection.load_projected
+
+        Returns:
+            dict -- parsed json response
+        """
+        if fields is not None:
+            fields = tuple(fields)
+
+        def fetch():
+            return self._request(method, endpoint, params, message, fields=fields, items=items)
+
+        if not self.coalesce_reads:
+            return fetch()
+        key = (method, endpoint, self.api_key, json.dumps(params, sort_keys=True), fields)
+        return self._single_flight.do(key, fetch)
+
+    def coalescing_stats(self):
+        """Get the request coalescing counters
+
+        Returns:
+            dict -- number of reads issued (calls), sent to the server
+                    (executions) and served by another in-flight call (coalesced)
+        """
+        return self._single_flight.stats()
+
+    async def call_async(self, method_name, *args, **kwargs):
+        """Call a client method from asyncio without blocking the event loop
+
+        The method runs in the loop's default executor, so concurrent identical
+        reads from coroutines and threads still share a single HTTP call.
+
+        Arguments:
+            method_name {str} -- name of the method to call, e.g. "get_project"
+
+        Returns:
+            object -- the return value of the method
+        """
+        method = getattr(self, method_name)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: method(*args, **kwargs))
 
     def get_default_engine(self, params={}):
         """Get the default engine for the given project
@@ -45,22 +202,7 @@ class CMLBootstrap:
         """
         get_engines_endpoint = "/".join([self.host, "api/v1/projects",
                                          self.username, self.project_name, "engine-images"])
-
-        res = requests.get(
-            get_engines_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("User details retrieved")
-
-        return response
+        return self._read("GET", get_engines_endpoint, params, "User details retrieved")
 
     def get_user(self, params={}):
         """Get details for a given user
@@ -74,21 +216,7 @@ class CMLBootstrap:
 
         get_user_endpoint = "/".join([self.host, "api/v1/users",
                                       self.username])
-        res = requests.get(
-            get_user_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("User details retrieved")
-
-        return response
+        return self._read("GET", get_user_endpoint, params, "User details retrieved")
 
     def get_project(self, params={}):
         """Get details for a given project
@@ -101,21 +229,7 @@ class CMLBootstrap:
         """
         get_project_endpoint = "/".join([self.host, "api/v1/projects",
                                          self.username, self.project_name])
-        res = requests.get(
-            get_project_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Project details retrieved")
-
-        return response
+        return self._read("GET", get_project_endpoint, params, "Project details retrieved")
 
     def run_experiment(self, params):
         """Run an experiment
@@ -128,47 +242,23 @@ class CMLBootstrap:
         """
         run_experiment_endpoint = "/".join([self.host,
                                             "api/altus-ds-1", "ds", "run"])
-        res = requests.post(
-            run_experiment_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
+        return self._request("POST", run_experiment_endpoint, params, "Experiment created")
 
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Experiment created")
-        return response
-
-    def get_jobs(self, params={}):
+    def get_jobs(self, params={}, fields=None, summary=False):
         """Return a list of jobs associated with the given project
 
         Arguments:
             params {dict} -- None
+            fields {list} -- Optional. Only return these fields of each job, e.g. ["id", "latest.status"]
+            summary {bool} -- Only return the id, name, type and latest status of each job. Cannot be combined with fields
 
         Returns:
             list -- List of jobs
         """
         get_jobs_endpoint = "/".join([self.host, "api/v1/projects",
                                       self.username, self.project_name, "jobs"])
-        res = requests.get(
-            get_jobs_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("List of jobs retrieved")
-
-        return response
+        fields = projection.resolve_fields(fields, summary, projection.JOB_SUMMARY_FIELDS)
+        return self._read("GET", get_jobs_endpoint, params, "List of jobs retrieved", fields)
 
     def delete_job(self, job_id, params={}):
         """Delete a job given its id
@@ -181,19 +271,7 @@ class CMLBootstrap:
         """
         delete_job_endpoint = "/".join([self.host, "api/v1/projects",
                                         self.username, self.project_name, "jobs", str(job_id)])
-        res = requests.delete(
-            delete_job_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        if (res.status_code != 204):
-            response = res.json()
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Job deleted")
+        self._request("DELETE", delete_job_endpoint, params, "Job deleted", expected_status=204, parse=False)
 
         return None
 
@@ -208,20 +286,7 @@ class CMLBootstrap:
         """
         create_job_endpoint = "/".join([self.host, "api/v1/projects",
                                         self.username, self.project_name, "jobs"])
-        res = requests.post(
-            create_job_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 201):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Job created")
-        return response
+        return self._request("POST", create_job_endpoint, params, "Job created", expected_status=201)
 
     def start_job(self, job_id, params={}):
         """Start a job
@@ -235,21 +300,7 @@ class CMLBootstrap:
         """
         start_job_endpoint = "/".join([self.host, "api/v1/projects",
                                        self.username, self.project_name, "jobs", str(job_id), "start"])
-        res = requests.post(
-            start_job_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Job started")
-
-        return response
+        return self._request("POST", start_job_endpoint, params, " Job started")
 
     def stop_job(self, job_id, params={}):
         """Stop a job
@@ -264,30 +315,17 @@ class CMLBootstrap:
 
         stop_job_endpoint = "/".join([self.host, "api/v1/projects",
                                       self.username, self.project_name, "jobs", str(job_id), "stop"])
-        res = requests.post(
-            stop_job_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
+        return self._request("POST", stop_job_endpoint, params, " Job stopped")
 
-        response = res.json()
-        logging.error(response)
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Job stopped")
-
-        return response
-
-    def get_models(self, params):
+    def get_models(self, params, fields=None, summary=False):
         """Return a list of models associated with the given project
 
         Arguments:
             params {dict} -- None
             If you are looking for the models in the current project, use
             {"projectId" : project_id } as the params where project_id is an int of the project number.
+            fields {list} -- Optional. Only return these fields of each model
+            summary {bool} -- Only return the id, name, crn and deployment status of each model. Cannot be combined with fields
 
         Returns:
             list -- List of models
@@ -295,21 +333,8 @@ class CMLBootstrap:
           
         get_models_endpoint = "/".join([self.host,
                                         "api/altus-ds-1", "models", "list-models"])
-        res = requests.post(
-            get_models_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("List of Models retrieved")
-
-        return response
+        fields = projection.resolve_fields(fields, summary, projection.MODEL_SUMMARY_FIELDS)
+        return self._read("POST", get_models_endpoint, params, "List of Models retrieved", fields)
 
     def delete_model(self, params):
         """Delete a project given its id
@@ -322,21 +347,7 @@ class CMLBootstrap:
         """
         delete_model_endpoint = "/".join([self.host,
                                           "api/altus-ds-1", "models", "delete-model"])
-        res = requests.post(
-            delete_model_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Model deleted")
-
-        return response
+        return self._request("POST", delete_model_endpoint, params, "Model deleted")
 
     def get_model(self, params):
         """Get model info given its id
@@ -349,21 +360,7 @@ class CMLBootstrap:
         """        
         get_model_endpoint = "/".join([self.host,
                                        "api/altus-ds-1", "models", "get-model"])
-        res = requests.post(
-            get_model_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(">> Got model")
-
-        return response
+        return self._read("POST", get_model_endpoint, params, ">> Got model")
 
     def create_model(self, params):
         """Create a model
@@ -376,21 +373,7 @@ class CMLBootstrap:
         """
         create_model_endpoint = "/".join([self.host,
                                           "api/altus-ds-1", "models", "create-model"])
-        res = requests.post(
-            create_model_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Model created")
-
-        return response
+        return self._request("POST", create_model_endpoint, params, " Model created")
 
     def rebuild_model(self, params):
         """Deploy a new model build
@@ -403,21 +386,7 @@ class CMLBootstrap:
         """
         build_model_endpoint = "/".join([self.host,
                                           "api/altus-ds-1", "models", "build-model"])
-        res = requests.post(
-            build_model_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Model created")
-
-        return response        
+        return self._request("POST", build_model_endpoint, params, " Model created")        
 
     def set_model_auth(self, params):
         """Enable or disable Model Authentication
@@ -431,19 +400,7 @@ class CMLBootstrap:
         """
         set_model_auth_endpoint = "/".join([self.host,
                                             "api/altus-ds-1", "models", "set-model-auth"])
-        res = requests.post(
-            set_model_auth_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(">> Set Model Auth")
-        return response
+        return self._request("POST", set_model_auth_endpoint, params, ">> Set Model Auth")
 
     def get_application(self, app_id, params):
         """Get details for an application
@@ -457,48 +414,23 @@ class CMLBootstrap:
         """
         get_application_endpoint = "/".join([self.host, "api/v1/projects",
                                              self.username, self.project_name, "applications", app_id])
-        res = requests.get(
-            get_application_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Application details retrieved")
+        return self._read("GET", get_application_endpoint, params, "Application details retrieved")
 
-        return response
-
-    def get_applications(self, params={}):
+    def get_applications(self, params={}, fields=None, summary=False):
         """Get list of applications within current project
 
         Arguments:
             params {dict} -- None
+            fields {list} -- Optional. Only return these fields of each application
+            summary {bool} -- Only return the id, name, subdomain and status of each application. Cannot be combined with fields
 
         Returns:
             list -- list of current applications
         """
         get_applications_endpoint = "/".join([self.host, "api/v1/projects",
                                               self.username, self.project_name, "applications"])
-        res = requests.get(
-            get_applications_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Application list retrieved")
-
-        return response
+        fields = projection.resolve_fields(fields, summary, projection.APPLICATION_SUMMARY_FIELDS)
+        return self._read("GET", get_applications_endpoint, params, " Application list retrieved", fields)
 
     def delete_application(self, application_id, params):
         """Delete application given id
@@ -508,25 +440,26 @@ class CMLBootstrap:
             params {dict} -- application details
 
         Returns:
-            None -- None
+            None -- None if the application was deleted, the error response otherwise
         """
         get_applications_endpoint = "/".join([self.host, "api/v1/projects",
                                               self.username, self.project_name, "applications", str(application_id)])
-        res = requests.delete(
-            get_applications_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
+        return self._request("DELETE", get_applications_endpoint, params, " Application deleted", parse=False)
 
-        if (res.status_code != 200):
-            response = res.json()
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Application deleted")
+    def restart_application(self, application_id, params={}):
+        """Restart an application given its id
 
-        return None
+        Arguments:
+            application_id {int} -- application id
+            params {dict} -- None
+
+        Returns:
+            [dict] -- [dictionary containing application details]
+        """
+        restart_application_endpoint = "/".join([self.host, "api/v1/projects",
+                                                 self.username, self.project_name, "applications",
+                                                 str(application_id), "restart"])
+        return self._request("POST", restart_application_endpoint, params, " Application restarted")
 
     def create_application(self, params):
         """Create an Application
@@ -539,21 +472,7 @@ class CMLBootstrap:
         """
         create_application_endpoint = "/".join([self.host, "api/v1/projects",
                                                 self.username, self.project_name, "applications"])
-        res = requests.post(
-            create_application_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-
-        response = res.json()
-        if (res.status_code != 201):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug(" Application created")
-
-        return response
+        return self._request("POST", create_application_endpoint, params, " Application created", expected_status=201)
 
     def create_environment_variable(self, params):
         """Add project level environment variables
@@ -569,19 +488,10 @@ class CMLBootstrap:
 
         create_environment_variable_endpoint = "/".join([self.host, "api/v1/projects",
                                                          self.username, self.project_name, "environment"])
-        res = requests.put(
-            create_environment_variable_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(env_vars)
-        )
-        #response = res.json()
-        if (res.status_code != 204):
-            logging.error("Reponse code was " + res.status_code)
-        else:
-            logging.debug("Environment variable created")
-
-        return res.status_code
+        status_code, _ = self._request("PUT", create_environment_variable_endpoint, env_vars,
+                                       "Environment variable created", expected_status=204,
+                                       parse=False, with_status=True)
+        return status_code
 
     def get_environment_variables(self, params={}):
         """Get the project level environment variables
@@ -594,39 +504,12 @@ class CMLBootstrap:
         """
         create_environment_variable_endpoint = "/".join([self.host, "api/v1/projects",
                                                          self.username, self.project_name, "environment"])
-    
-        res = requests.get(
-                create_environment_variable_endpoint,
-                headers={"Content-Type": "application/json"},
-                auth=(self.api_key, ""),
-                data=json.dumps(params)
-        )
-        
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Environment variables retrieved")
-
-        return response
+        return self._read("GET", create_environment_variable_endpoint, params, "Environment variables retrieved")
     
     def add_project_editor(self, params):
         add_project_editor_endpoint = "/".join([self.host, "api/v1/projects",
                                                          self.username, self.project_name, "editors"])
-        res = requests.post(
-            add_project_editor_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-        response = res.json()
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Editor added")
-        return response
+        return self._request("POST", add_project_editor_endpoint, params, "Editor added")
 
     def get_cloud_storage(self):
         """Get the cloud storage URI
@@ -645,11 +528,11 @@ class CMLBootstrap:
                 for prop in root.findall('property'):
                     if prop.find('name').text == "hive.metastore.warehouse.dir":
                         storage = prop.find('value').text.split("/")[0] + "//" + prop.find('value').text.split("/")[2]
-                logging.debug("Storage Variable Found")
+                logger.debug("Storage Variable Found")
             except:
-                logging.error("hive-site.xml file not found")
+                logger.error("hive-site.xml file not found")
         except:
-            logging.error('HADOOP_CONF_DIR environment variable not defined')
+            logger.error('HADOOP_CONF_DIR environment variable not defined')
         return storage
     
     def get_id_broker(self):
@@ -673,9 +556,9 @@ class CMLBootstrap:
                     if prop.find('name').text == "fs.s3a.ext.cab.address":
                         id_broker = prop.find('value').text.split("//")[1].split(":")[0]
             except:
-                logging.error("Unable to get S3 credentails")
+                logger.error("Unable to get S3 credentails")
         except:
-            logging.error('HADOOP_CONF_DIR environment variable not defined')
+            logger.error('HADOOP_CONF_DIR environment variable not defined')
         return id_broker
 
 
@@ -706,37 +589,26 @@ class CMLBootstrap:
                 aws_secret_access_key=SECRET_KEY,
                 aws_session_token=SESSION_TOKEN,
             )
-            logging.debug("S3 credential found and boto3 client instantiated")
+            logger.debug("S3 credential found and boto3 client instantiated")
         except:
-            logging.error("Unable to get S3 credentails")
+            logger.error("Unable to get S3 credentails")
         return client
     
-    def get_runtimes(self, params={}):
+    def get_runtimes(self, params={}, fields=None, summary=False):
         """Get the list of runtimes including ids
 
         Arguments:
             params {dict} -- None needed.
+            fields {list} -- Optional. Only return these fields of each runtime
+            summary {bool} -- Only return the id, image, editor, kernel, edition, version and status of each runtime. Cannot be combined with fields
 
         Returns:
             dict -- [dictionary containing runtimes and the associated details]
         """
         get_runtimes_endpoint = "/".join([self.host, "api/v1/runtimes?includeAll=true"])
-
-        res = requests.get(
-            get_runtimes_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-        response = res.json()
-        
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Runtime details retrieved")
-
-        return response
+        fields = projection.resolve_fields(fields, summary, projection.RUNTIME_SUMMARY_FIELDS)
+        return self._read("GET", get_runtimes_endpoint, params, "Runtime details retrieved",
+                          fields, items="runtimes.item")
 
     
     def get_runtimes_addons(self, params={"component":"Spark"}):
@@ -749,20 +621,20 @@ class CMLBootstrap:
             dict -- [dictionary containing runtime addons]
         """
         get_runtimes_endpoint = "/".join([self.host, "api/v1/runtime-addons"])
+        return self._request("POST", get_runtimes_endpoint, params, "Runtime addon details retrieved")
 
-        res = requests.post(
-            get_runtimes_endpoint,
-            headers={"Content-Type": "application/json"},
-            auth=(self.api_key, ""),
-            data=json.dumps(params)
-        )
-        response = res.json()
-        
-        if (res.status_code != 200):
-            logging.error(response["message"])
-            logging.error(response)
-        else:
-            logging.debug("Runtime addon details retrieved")
+    def get_runtime_catalog(self, ttl=DEFAULT_TTL, refresh=False, path=None):
+        """Get an indexed catalog of runtimes, Spark addons and the default engine
 
-        return response
-    
+        The catalog is cached in a local file and only fetched again once it
+        is older than ttl seconds.
+
+        Arguments:
+            ttl {int} -- seconds a cached catalog stays valid
+            refresh {bool} -- fetch the catalog even if the cache is still valid
+            path {str} -- cache file, defaults to one per host, user and project under ~/.cache/cmlbootstrap
+
+        Returns:
+            RuntimeCatalog -- catalog answering find_runtime(kernel=..., editor=...) lookups
+        """
+        return RuntimeCatalog.load(self, path=path, ttl=ttl, refresh=refresh)
@@ -1 +1,5 @@
 from cmlbootstrap.CMLBootstrap import CMLBootstrap
+from cmlbootstrap.runtimes import RuntimeCatalog
+from cmlbootstrap.applications import ApplicationManager, ApplicationError
+from cmlbootstrap.log import JsonFormatter, enable_json_logging
+from cmlbootstrap.loadtest import ModelLoadTest
@@ -0,0 +1,246 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Application fields carried over when an application is recreated.
+RECREATE_FIELDS = ("name", "subdomain", "description", "type", "script", "kernel",
+                   "cpu", "memory", "nvidiaGPU", "environment", "runtimeId",
+                   "bypass_authentication")
+
+READY_STATUS = "running"
+FAILED_STATUSES = ("failed",)
+
+
+class ApplicationError(RuntimeError):
+    """An application operation failed.
+
+    Attributes:
+        details (dict): Fields merged into the application's result, e.g. the
+            id of the application after the failure and the params needed to
+            create it again by hand.
+    """
+
+    def __init__(self, message, **details):
+        super().__init__(message)
+        self.details = details
+
+
+class ApplicationManager:
+    """Restart, recreate and health check many applications of a project at once.
+
+    Operations run in parallel with at most max_workers applications in flight.
+    After each restart or recreate the application status (and optionally an
+    HTTP health endpoint served by the application) is polled with exponential
+    backoff until it is ready or timeout seconds have passed.
+
+    Attributes:
+        cml (CMLBootstrap): Client for the project owning the applications.
+        max_workers (int): Maximum number of applications handled concurrently.
+        timeout (float): Seconds to wait for each application to become ready.
+        initial_delay (float): First delay between two readiness probes.
+        max_delay (float): Upper bound for the delay between probes.
+    """
+
+    def __init__(self, cml, max_workers=8, timeout=600, initial_delay=2, max_delay=30):
+        self.cml = cml
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+
+    def _applications(self, app_ids=None):
+        applications = self.cml.get_applications()
+        if not isinstance(applications, list):
+            raise ValueError("Unable to list applications: {}".format(applications.get("message", applications)))
+        if app_ids is None:
+            return applications
+        wanted = set(str(app_id) for app_id in app_ids)
+        return [app for app in applications if str(app.get("id")) in wanted]
+
+    def plan(self, app_ids=None, action="restart", changes=None):
+        """Describe what restart or recreate would do without changing anything
+
+        Arguments:
+            app_ids {list} -- application ids, defaults to every application in the project
+            action {str} -- "restart" or "recreate"
+            changes {dict} -- fields to override when recreating, e.g. {"runtimeId": 12}
+
+        Returns:
+            list -- one dict per application with its id, name, action and the
+                    changed fields as {field: [old, new]}
+        """
+        if action not in ("restart", "recreate"):
+            raise ValueError("Unknown action: {}".format(action))
+        changes = changes or {}
+        plan = []
+        for app in self._applications(app_ids):
+            diff = {field: [app.get(field), value]
+                    for field, value in changes.items() if app.get(field) != value}
+            plan.append({
+                "id": app.get("id"),
+                "name": app.get("name"),
+                "status": app.get("status"),
+                "action": action,
+                "changes": diff,
+            })
+        return plan
+
+    def restart(self, app_ids=None, health_path=None, dry_run=False):
+        """Restart applications in parallel and wait for them to be ready
+
+        Arguments:
+            app_ids {list} -- application ids, defaults to every application in the project
+            health_path {str} -- optional path probed over HTTP once the application is running, e.g. "/health"
+            dry_run {bool} -- only return the plan
+
+        Returns:
+            list -- per application results, see wait_ready
+        """
+        if dry_run:
+            return self.plan(app_ids, "restart")
+        return self._run(self._applications(app_ids), self._restart_one, health_path)
+
+    def recreate(self, app_ids=None, changes=None, health_path=None, dry_run=False):
+        """Delete and create applications again in parallel, optionally changing fields
+
+        Arguments:
+            app_ids {list} -- application ids, defaults to every application in the project
+            changes {dict} -- fields to override, e.g. {"runtimeId": 12}
+            health_path {str} -- optional path probed over HTTP once the application is running
+            dry_run {bool} -- only return the plan
+
+        Returns:
+            list -- per application results, see wait_ready. The id is the one of the new application.
+                    An application is only created once its delete succeeded. If the create
+                    fails the original application is created again; the result then holds
+                    the params of the original application, restored (bool) and the id of
+                    whichever application exists, None if the restore failed as well.
+        """
+        if dry_run:
+            return self.plan(app_ids, "recreate", changes)
+        changes = changes or {}
+        return self._run(self._applications(app_ids),
+                         lambda app: self._recreate_one(app, changes), health_path)
+
+    def _run(self, applications, operation, health_path):
+        def handle(app):
+            started = time.time()
+            try:
+                app_id = operation(app)
+                result = self.wait_ready(app_id, health_path, started)
+            except Exception as e:
+                logger.error("Application %s failed: %s", app.get("name"), e)
+                result = {"id": app.get("id"), "ready": False, "status": None,
+                          "latency": time.time() - started, "error": str(e)}
+                if isinstance(e, ApplicationError):
+                    result.update(e.details)
+            result["name"] = app.get("name")
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(handle, applications))
+
+    def _restart_one(self, app):
+        response = self.cml.restart_application(app["id"])
+        if isinstance(response, dict) and "message" in response and "id" not in response:
+            raise ApplicationError(response["message"])
+        return app["id"]
+
+    def _recreate_one(self, app, changes):
+        original = {field: app[field] for field in RECREATE_FIELDS if field in app}
+        params = dict(original, **changes)
+
+        error = self.cml.delete_application(app["id"], {})
+        if error is not None:
+            raise ApplicationError("delete failed, application left unchanged: {}".format(_message(error)))
+
+        response = self.cml.create_application(params)
+        if "id" in response:
+            return response["id"]
+
+        # The application is gone, put the original back rather than leave nothing.
+        message = _message(response)
+        restored = self.cml.create_application(original)
+        if "id" in restored:
+            raise ApplicationError("create failed, original application restored: {}".format(message),
+                                   id=restored["id"], restored=True, params=original)
+        raise ApplicationError("create failed and restoring the original failed: {}; {}".format(
+                                   message, _message(restored)),
+                               id=None, deleted_id=app["id"], restored=False, params=original)
+
+    def wait_ready(self, app_id, health_path=None, started=None):
+        """Poll an application with exponential backoff until it is ready
+
+        The first probe happens after initial_delay seconds.
+
+        Arguments:
+            app_id {int} -- application id
+            health_path {str} -- optional path that must answer with a 2xx HTTP status
+            started {float} -- time the readiness latency is measured from, defaults to now
+
+        Returns:
+            dict -- id, ready (bool), last status, latency in seconds and error
+        """
+        if started is None:
+            started = time.time()
+        deadline = started + self.timeout
+        delay = self.initial_delay
+        status = None
+        error = None
+
+        while True:
+            # Sleep first: right after a restart the application still reports
+            # the status of the instance being replaced.
+            time.sleep(delay)
+            app = self.cml.get_application(str(app_id), {})
+            status = app.get("status")
+            if status == READY_STATUS:
+                if health_path is None or self._healthy(app, health_path):
+                    return {"id": app_id, "ready": True, "status": status,
+                            "latency": time.time() - started, "error": None}
+                error = "health check failed"
+            elif status in FAILED_STATUSES:
+                error = "application " + status
+                break
+
+            delay = min(delay * 2, self.max_delay)
+            if time.time() + delay > deadline:
+                error = error or "timed out"
+                break
+
+        return {"id": app_id, "ready": False, "status": status,
+                "latency": time.time() - started, "error": error}
+
+    def _healthy(self, app, health_path):
+        url = self.application_url(app) + "/" + health_path.lstrip("/")
+        try:
+            # Unauthenticated requests are redirected to the login page,
+            # which answers 200, so a redirect is never a healthy answer.
+            res = requests.get(url, timeout=10, allow_redirects=False)
+        except requests.RequestException as e:
+            logger.debug("Health probe %s failed: %s", url, e)
+            return False
+        return 200 <= res.status_code < 300
+
+    def application_url(self, app):
+        """Get the URL an application is served on
+
+        Arguments:
+            app {dict} -- application details
+
+        Returns:
+            str -- e.g. https://<subdomain>.<workspace domain>
+        """
+        host = urlparse(self.cml.host)
+        return "{}://{}.{}".format(host.scheme, app["subdomain"], host.netloc)
+
+
+def _message(response):
+    if isinstance(response, dict):
+        return response.get("message", response)
+    return response
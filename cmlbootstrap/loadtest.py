@@ -0,0 +1,217 @@
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list
+
+    Arguments:
+        sorted_values {list} -- values in ascending order
+        pct {float} -- percentile between 0 and 100
+
+    Returns:
+        float -- the percentile, None for an empty list
+    """
+    if not sorted_values:
+        return None
+    n = len(sorted_values)
+    rank = min(max(math.ceil(pct / 100.0 * n), 1), n)
+    return sorted_values[rank - 1]
+
+
+class ModelLoadTest:
+    """Send prediction requests to a deployed model at a target rate and measure latency.
+
+    Requests are scheduled open-loop from an asyncio event loop at a fixed
+    rate and sent from a pool of concurrency worker threads, each holding its
+    own requests.Session so connections are reused. Latency is measured from
+    the time a request was scheduled, so time spent waiting for a free worker
+    counts against the model instead of silently lowering the offered rate.
+
+    Attributes:
+        endpoint (str): Model prediction URL, e.g. https://modelservice.<domain>/model
+        access_key (str): Model access key.
+        api_key (str): Model API key, only needed when model authentication is enabled.
+        replicas (int): Number of model replicas, used to report per replica load.
+        concurrency (int): Maximum number of requests in flight.
+        timeout (float): Seconds before a single request is abandoned.
+    """
+
+    def __init__(self, endpoint, access_key, api_key=None, replicas=1, concurrency=32, timeout=30):
+        self.endpoint = endpoint
+        self.access_key = access_key
+        self.api_key = api_key
+        self.replicas = replicas
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_model(cls, cml, model_id, api_key=None, **kwargs):
+        """Build a load test for a model deployed in the workspace
+
+        Arguments:
+            cml {CMLBootstrap} -- client for the workspace
+            model_id {int} -- model id
+            api_key {str} -- model API key, only needed when model authentication is enabled
+
+        Returns:
+            ModelLoadTest -- load test targeting the model's endpoint
+        """
+        model = cml.get_model({"id": model_id, "latestModelDeployment": True,
+                               "latestModelBuild": True})
+        if "accessKey" not in model:
+            raise ValueError("Unable to get model {}: {}".format(model_id, model.get("message", model)))
+
+        deployment = model.get("latestModelDeployment") or {}
+        replicas = (deployment.get("replicationPolicy") or {}).get("numReplicas", 1)
+        endpoint = "{}://modelservice.{}/model".format(*_scheme_and_domain(cml.host))
+        return cls(endpoint, model["accessKey"], api_key=api_key, replicas=replicas, **kwargs)
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["Content-Type"] = "application/json"
+            if self.api_key:
+                session.headers["Authorization"] = "Bearer " + self.api_key
+        return session
+
+    def _predict(self, body, scheduled, stats):
+        queue_wait = time.perf_counter() - scheduled
+        with self._lock:
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        status = None
+        ok = False
+        try:
+            res = self._session().post(self.endpoint, data=body, timeout=self.timeout)
+            status = res.status_code
+            if status < 400:
+                # CML models answer {"success": ..., "response": ...}; anything
+                # else that parses as JSON is accepted as is.
+                response = res.json()
+                ok = not (isinstance(response, dict) and response.get("success") is False)
+        except (requests.RequestException, ValueError) as e:
+            logger.debug("Prediction request failed: %s", e)
+        finally:
+            latency = time.perf_counter() - scheduled
+            with self._lock:
+                stats["in_flight"] -= 1
+                stats["latencies"].append(latency)
+                stats["queue_waits"].append(queue_wait)
+                stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+                if not ok:
+                    stats["errors"] += 1
+
+    async def run_async(self, payload, rps=10, duration=30):
+        """Run the load test from a running event loop
+
+        Arguments:
+            payload {dict} -- model input, sent as {"accessKey": ..., "request": payload}
+            rps {float} -- target requests per second
+            duration {float} -- seconds to generate load for
+
+        Returns:
+            dict -- report, see run
+        """
+        if rps <= 0:
+            raise ValueError("rps must be positive, got {}".format(rps))
+        if duration <= 0:
+            raise ValueError("duration must be positive, got {}".format(duration))
+        body = json.dumps({"accessKey": self.access_key, "request": payload})
+        stats = {"in_flight": 0, "max_in_flight": 0, "errors": 0,
+                 "latencies": [], "queue_waits": [], "statuses": {}}
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / rps
+        total = int(rps * duration)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            start = time.perf_counter()
+            futures = []
+            for i in range(total):
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                futures.append(loop.run_in_executor(
+                    executor, self._predict, body, scheduled, stats))
+            await asyncio.gather(*futures)
+            elapsed = time.perf_counter() - start
+
+        return self._report(stats, rps, elapsed)
+
+    def run(self, payload, rps=10, duration=30):
+        """Run the load test and wait for it to finish
+
+        Arguments:
+            payload {dict} -- model input, sent as {"accessKey": ..., "request": payload}
+            rps {float} -- target requests per second
+            duration {float} -- seconds to generate load for
+
+        Returns:
+            dict -- requests sent, errors and error_rate, target and achieved
+                    throughput (rps), p50/p95/p99/max latency in ms, status code
+                    counts, time spent waiting for a free worker, peak and mean
+                    in flight requests and the mean load per replica.
+                    client_saturated is True when every worker of this load
+                    test was busy at some point: requests then queued on the
+                    client, so raise concurrency before reading the latencies
+                    as the model's. Whether the replicas kept up shows in
+                    in_flight_per_replica and the latencies.
+        """
+        return asyncio.run(self.run_async(payload, rps, duration))
+
+    def _report(self, stats, rps, elapsed):
+        latencies = sorted(stats["latencies"])
+        count = len(latencies)
+        throughput = count / elapsed if elapsed > 0 else 0.0
+        mean_latency = sum(latencies) / count if count else 0.0
+        # Little's law: mean number of requests being served concurrently.
+        mean_in_flight = throughput * mean_latency
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 1)
+
+        report = {
+            "requests": count,
+            "errors": stats["errors"],
+            "error_rate": stats["errors"] / count if count else 0.0,
+            "target_rps": rps,
+            "throughput_rps": round(throughput, 2),
+            "latency_ms": {
+                "p50": ms(percentile(latencies, 50)),
+                "p95": ms(percentile(latencies, 95)),
+                "p99": ms(percentile(latencies, 99)),
+                "max": ms(latencies[-1] if latencies else None),
+                "mean": ms(mean_latency),
+            },
+            "queue_wait_p99_ms": ms(percentile(sorted(stats["queue_waits"]), 99)),
+            "statuses": stats["statuses"],
+            "max_in_flight": stats["max_in_flight"],
+            "mean_in_flight": round(mean_in_flight, 2),
+            "replicas": self.replicas,
+            "in_flight_per_replica": round(mean_in_flight / self.replicas, 2) if self.replicas else None,
+            # Every worker busy means requests queued on the client, which
+            # says nothing about the replicas on its own.
+            "client_saturated": stats["max_in_flight"] >= self.concurrency,
+        }
+        logger.info("Load test finished: %s requests, %s rps, p99 %s ms, %s errors",
+                    count, report["throughput_rps"], report["latency_ms"]["p99"], stats["errors"])
+        return report
+
+
+def _scheme_and_domain(host):
+    parsed = urlparse(host)
+    return parsed.scheme or "https", parsed.netloc or parsed.path
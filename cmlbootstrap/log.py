@@ -0,0 +1,87 @@
+import json
+import logging
+import random
+import sys
+
+# Attributes every LogRecord has; anything else was passed through extra=.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+DEFAULT_PAYLOAD_MAX_CHARS = 1000
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line.
+
+    Structured fields passed through extra= (endpoint, method, status,
+    latency_ms, request_id, ...) are emitted as top level keys.
+    """
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+def enable_json_logging(level=logging.INFO, stream=None):
+    """Send cmlbootstrap logs to a stream as JSON lines
+
+    Arguments:
+        level {int} -- minimum level to emit
+        stream {file} -- defaults to sys.stderr
+
+    Returns:
+        logging.Handler -- the handler added to the cmlbootstrap logger
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("cmlbootstrap")
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+class PayloadSampler:
+    """Decide which response payloads get logged and cap their size.
+
+    Attributes:
+        rate (float): Fraction of successful responses whose payload is logged at DEBUG.
+        max_chars (int): Maximum number of characters of a payload written to the log.
+    """
+
+    def __init__(self, rate=0.0, max_chars=DEFAULT_PAYLOAD_MAX_CHARS):
+        self.rate = rate
+        self.max_chars = max_chars
+
+    def truncate(self, payload):
+        """Serialise a payload, keeping at most max_chars characters"""
+        text = payload if isinstance(payload, str) else json.dumps(payload, default=str)
+        if len(text) > self.max_chars:
+            return "{}... ({} chars)".format(text[:self.max_chars], len(text))
+        return text
+
+    def log(self, logger, level, payload, extra=None, always=False):
+        """Log a payload if the level is enabled and it is sampled
+
+        Nothing is serialised unless the record is actually emitted.
+
+        Arguments:
+            logger {logging.Logger} -- logger to write to
+            level {int} -- log level
+            payload {object} -- parsed response
+            extra {dict} -- structured fields for the record
+            always {bool} -- skip sampling, e.g. for error responses
+        """
+        if not logger.isEnabledFor(level):
+            return
+        if not always and (self.rate <= 0 or random.random() >= self.rate):
+            return
+        logger.log(level, "payload: %s", self.truncate(payload), extra=extra)
@@ -0,0 +1,105 @@
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# Fields kept when a list method is called with summary=True.
+JOB_SUMMARY_FIELDS = ("id", "name", "type", "latest.status")
+MODEL_SUMMARY_FIELDS = ("id", "name", "crn", "latestModelDeployment.status")
+RUNTIME_SUMMARY_FIELDS = ("id", "imageIdentifier", "editor", "kernel",
+                          "edition", "shortVersion", "status")
+APPLICATION_SUMMARY_FIELDS = ("id", "name", "subdomain", "status")
+
+
+def resolve_fields(fields, summary, summary_fields):
+    """Get the fields a list method should keep
+
+    Arguments:
+        fields {iterable} -- fields requested by the caller, or None
+        summary {bool} -- whether the caller asked for the summary fields
+        summary_fields {tuple} -- the method's summary fields
+
+    Returns:
+        tuple -- fields to keep, None to keep everything
+    """
+    if summary and fields is not None:
+        raise ValueError("Pass either fields or summary=True, not both")
+    return summary_fields if summary else fields
+
+
+def project(item, fields):
+    """Keep only the given fields of a dict
+
+    Arguments:
+        item {dict} -- item to project
+        fields {iterable} -- field names, nested fields use dots ("latest.status")
+
+    Returns:
+        dict -- a new dict containing only the requested fields that exist
+    """
+    if not isinstance(item, dict):
+        return item
+    projected = {}
+    for field in fields:
+        head, _, rest = field.partition(".")
+        if head not in item:
+            continue
+        if rest:
+            value = item[head]
+            if isinstance(value, dict):
+                nested = projected.setdefault(head, {})
+                if isinstance(nested, dict):
+                    nested.update(project(value, [rest]))
+            else:
+                projected[head] = value
+        else:
+            projected[head] = item[head]
+    return projected
+
+
+def project_items(items, fields):
+    """Project every item of a list
+
+    Arguments:
+        items {list} -- list of dicts
+        fields {iterable} -- field names
+
+    Returns:
+        list -- projected items
+    """
+    return [project(item, fields) for item in items]
+
+
+def load_projected(res, items, fields):
+    """Parse a successful response keeping only the requested fields
+
+    When ijson is installed the body is parsed incrementally and each list
+    item is projected as soon as it is complete, otherwise the whole body is
+    parsed with the json module and projected afterwards.
+
+    Arguments:
+        res {requests.Response} -- response opened with stream=True
+        items {str} -- ijson prefix of the list to project, "item" for a
+                       top level list or e.g. "runtimes.item"
+        fields {iterable} -- field names
+
+    Returns:
+        list or dict -- the projected list, wrapped in its parent key if the
+                        list is not at the top level. The list is empty if the
+                        body has no list at that location.
+    """
+    path = items.split(".")[:-1]
+    if ijson is not None:
+        res.raw.decode_content = True
+        projected = [project(item, fields)
+                     for item in ijson.items(res.raw, items, use_float=True)]
+    else:
+        response = res.json()
+        for key in path:
+            response = response.get(key) if isinstance(response, dict) else None
+        projected = project_items(response, fields) if isinstance(response, list) else []
+
+    for key in reversed(path):
+        projected = {key: projected}
+    return projected
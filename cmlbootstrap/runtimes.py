@@ -0,0 +1,291 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+DEFAULT_TTL = 3600
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cmlbootstrap")
+
+logger = logging.getLogger(__name__)
+
+
+class RuntimeCatalog:
+    """Indexed view of the runtimes, runtime addons and default engine of a CML workspace.
+
+    The catalog is built from a single call to each of get_runtimes,
+    get_runtimes_addons and get_default_engine, and every lookup afterwards is
+    answered from in-memory indexes without touching the network. Use load to
+    persist the catalog to a local cache file and reuse it until it expires.
+
+    Attributes:
+        runtimes (list): Runtime dicts as returned by the api.
+        addons (list): Spark runtime addon dicts as returned by the api.
+        default_engine (dict): Default engine details for the project.
+        fetched_at (float): Unix time at which the catalog was retrieved.
+    """
+
+    # Keyword arguments of find_runtime and the runtime fields they match.
+    FIELDS = {
+        "kernel": "kernel",
+        "editor": "editor",
+        "edition": "edition",
+        "short_version": "shortVersion",
+    }
+
+    def __init__(self, runtimes, addons=(), default_engine=None, fetched_at=None):
+        self.runtimes = list(runtimes)
+        self.addons = list(addons)
+        self.default_engine = default_engine
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self._build_indexes()
+
+    def _build_indexes(self):
+        # Newest runtimes first, so find_runtime returns the latest match.
+        self.runtimes.sort(key=lambda r: r.get("id", 0), reverse=True)
+        self._by_id = {r.get("id"): r for r in self.runtimes}
+
+        # One index per combination of criteria, keyed by the normalised
+        # values, so that any find_runtime query is a single dict lookup.
+        names = sorted(self.FIELDS)
+        self._indexes = {}
+        for size in range(1, len(names) + 1):
+            for combination in itertools.combinations(names, size):
+                index = self._indexes[combination] = {}
+                for runtime in self.runtimes:
+                    key = tuple(_normalise(runtime.get(self.FIELDS[name]))
+                                for name in combination)
+                    index.setdefault(key, []).append(runtime)
+
+        self._addons_by_id = {}
+        self._addons_by_spark_version = {}
+        for addon in self.addons:
+            self._addons_by_id[addon.get("identifier")] = addon
+            version = _spark_version(addon)
+            if version is not None:
+                self._addons_by_spark_version.setdefault(version, []).append(addon)
+
+    @classmethod
+    def from_cml(cls, cml):
+        """Retrieve runtimes, addons and default engine from the api
+
+        Arguments:
+            cml {CMLBootstrap} -- client for the workspace
+
+        Returns:
+            RuntimeCatalog -- a freshly built catalog
+        """
+        response = cml.get_runtimes()
+        if not isinstance(response, dict) or "runtimes" not in response:
+            raise ValueError("Unable to retrieve runtimes: {}".format(_error_message(response)))
+
+        addons = cml.get_runtimes_addons()
+        if isinstance(addons, dict) and not _is_error(addons):
+            addons = next((v for v in addons.values() if isinstance(v, list)), None)
+        if not isinstance(addons, list):
+            raise ValueError("Unable to retrieve runtime addons: {}".format(_error_message(addons)))
+
+        default_engine = cml.get_default_engine()
+        if _is_error(default_engine):
+            raise ValueError("Unable to retrieve default engine: {}".format(_error_message(default_engine)))
+
+        return cls(response["runtimes"], addons, default_engine)
+
+    @classmethod
+    def load(cls, cml, path=None, ttl=DEFAULT_TTL, refresh=False):
+        """Load the catalog from the cache file, fetching it if missing or expired
+
+        Arguments:
+            cml {CMLBootstrap} -- client for the workspace
+            path {str} -- cache file, defaults to one per host, user and project under ~/.cache/cmlbootstrap
+            ttl {int} -- seconds a cached catalog stays valid
+            refresh {bool} -- ignore the cache file and fetch the catalog
+
+        Returns:
+            RuntimeCatalog -- the cached or freshly fetched catalog
+        """
+        if path is None:
+            path = cls.default_path(cml.host, cml.username, cml.project_name)
+
+        if not refresh:
+            try:
+                catalog = cls.read(path)
+                if not catalog.expired(ttl):
+                    logger.debug("Runtime catalog loaded from %s", path)
+                    return catalog
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                logger.debug("Runtime catalog cache %s missing or unreadable", path)
+
+        catalog = cls.from_cml(cml)
+        try:
+            catalog.save(path)
+        except OSError:
+            logger.warning("Unable to write runtime catalog cache %s", path)
+        return catalog
+
+    @staticmethod
+    def default_path(host, username, project_name):
+        """Get the default cache file for a project
+
+        The default engine is a project setting, so each project gets its own file.
+
+        Arguments:
+            host {str} -- URL for the CML instance host
+            username {str} -- project owner
+            project_name {str} -- project name
+
+        Returns:
+            str -- path of the cache file
+        """
+        key = "/".join([host, str(username), str(project_name)])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(DEFAULT_CACHE_DIR, "runtimes-{}.json".format(digest))
+
+    @classmethod
+    def read(cls, path):
+        """Read a catalog from a cache file
+
+        Arguments:
+            path {str} -- cache file written by save
+
+        Returns:
+            RuntimeCatalog -- the cached catalog
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("Malformed runtime catalog cache " + path)
+        return cls(data["runtimes"], data["addons"], data["default_engine"], data["fetched_at"])
+
+    def save(self, path):
+        """Write the catalog to a cache file
+
+        The file is written atomically so concurrent readers never see a
+        partial catalog.
+
+        Arguments:
+            path {str} -- cache file
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            "fetched_at": self.fetched_at,
+            "runtimes": self.runtimes,
+            "addons": self.addons,
+            "default_engine": self.default_engine,
+        }
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def expired(self, ttl=DEFAULT_TTL):
+        """Check whether the catalog is older than ttl seconds
+
+        Returns:
+            bool -- True if the catalog should be fetched again
+        """
+        return time.time() - self.fetched_at > ttl
+
+    def find_runtimes(self, kernel=None, editor=None, edition=None, short_version=None):
+        """Find all runtimes matching the given criteria, newest first
+
+        Arguments:
+            kernel {str} -- e.g. "Python 3.9"
+            editor {str} -- e.g. "Workbench", "JupyterLab"
+            edition {str} -- e.g. "Standard", "Nvidia GPU"
+            short_version {str} -- e.g. "2021.12"
+
+        Returns:
+            list -- matching runtime dicts. Matching is case insensitive.
+        """
+        criteria = {"kernel": kernel, "editor": editor,
+                    "edition": edition, "short_version": short_version}
+        names = tuple(name for name in sorted(criteria) if criteria[name] is not None)
+        if not names:
+            return list(self.runtimes)
+        key = tuple(_normalise(criteria[name]) for name in names)
+        return list(self._indexes[names].get(key, ()))
+
+    def find_runtime(self, kernel=None, editor=None, edition=None, short_version=None):
+        """Find the newest runtime matching the given criteria
+
+        Arguments:
+            kernel {str} -- e.g. "Python 3.9"
+            editor {str} -- e.g. "Workbench", "JupyterLab"
+            edition {str} -- e.g. "Standard", "Nvidia GPU"
+            short_version {str} -- e.g. "2021.12"
+
+        Returns:
+            dict -- the runtime, or None if nothing matches
+        """
+        runtimes = self.find_runtimes(kernel, editor, edition, short_version)
+        return runtimes[0] if runtimes else None
+
+    def get_runtime(self, runtime_id):
+        """Get a runtime given its id
+
+        Returns:
+            dict -- the runtime, or None if unknown
+        """
+        return self._by_id.get(runtime_id)
+
+    def get_addon(self, identifier):
+        """Get a runtime addon given its identifier
+
+        Returns:
+            dict -- the addon, or None if unknown
+        """
+        return self._addons_by_id.get(identifier)
+
+    def spark_addons(self, spark_version=None):
+        """Get the Spark addons, optionally only those for a Spark version
+
+        Arguments:
+            spark_version {str} -- Spark major.minor version, e.g. "3.2"
+
+        Returns:
+            list -- matching addon dicts
+        """
+        if spark_version is None:
+            return list(self.addons)
+        version = ".".join(str(spark_version).split(".")[:2])
+        return list(self._addons_by_spark_version.get(version, ()))
+
+
+def _is_error(response):
+    """Api methods return the parsed error body, a dict with a message, on failure"""
+    return isinstance(response, dict) and "message" in response
+
+
+def _error_message(response):
+    if isinstance(response, dict):
+        return response.get("message", response)
+    return response
+
+
+def _normalise(value):
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+# "Spark 3.2.3 - CDE 1.19.2" in display names, "spark323-..." in identifiers.
+_SPARK_DISPLAY_VERSION = re.compile(r"spark\s*v?(\d+)\.(\d+)", re.IGNORECASE)
+_SPARK_IDENTIFIER_VERSION = re.compile(r"spark(\d)(\d)", re.IGNORECASE)
+
+
+def _spark_version(addon):
+    """Extract the Spark major.minor version from an addon's name or identifier"""
+    match = (_SPARK_DISPLAY_VERSION.search(str(addon.get("displayName", "")))
+             or _SPARK_IDENTIFIER_VERSION.search(str(addon.get("identifier", ""))))
+    if match:
+        return "{}.{}".format(match.group(1), match.group(2))
+    return None
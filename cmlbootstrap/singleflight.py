@@ -0,0 +1,90 @@
+import copy
+import threading
+
+
+class _Call:
+    """A single in-flight call shared by every caller with the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into a single execution.
+
+    The first caller for a given key runs the function, every caller that
+    arrives with the same key while it is still running waits for it and
+    receives its own copy of the same result (or the same exception). Once the
+    call completes the key is forgotten, so this is not a cache.
+
+    Attributes:
+        calls (int): Total number of calls made through this group.
+        executions (int): Number of calls that actually ran the function.
+        coalesced (int): Number of calls that were served by another caller.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) once for all concurrent callers of key
+
+        Arguments:
+            key {hashable} -- identifies identical calls
+            fn {callable} -- function to execute
+
+        Returns:
+            object -- the return value of fn
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # Followers deep copy the shared result, so the leader's caller gets
+        # its own copy too and is free to mutate it.
+        if call.waiters:
+            return copy.deepcopy(call.result)
+        return call.result
+
+    def stats(self):
+        """Return the coalescing counters
+
+        Returns:
+            dict -- calls, executions and coalesced counts
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
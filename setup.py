@@ -10,6 +10,10 @@ setuptools.setup(
     download_url='https://github.com/fastforwardlabs/cmlbootstrap/archive/v0.0.2.tar.gz',
     keywords=['CDSW', 'Cloudera', 'Machine Learning'],
     install_requires=['boto3==1.17.62','requests-kerberos==0.12.0'],
+    extras_require={
+        'fast': ['ijson>=3.1', 'brotli'],
+        'tests': ['pytest', 'ijson>=3.1'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
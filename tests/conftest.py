@@ -0,0 +1,5 @@
+import os
+
+# CMLBootstrap reads its default host from the environment at import time.
+os.environ.setdefault("CDSW_API_URL", "https://ml.example.com/api/v1")
+os.environ.setdefault("CDSW_DOMAIN", "ml.example.com")
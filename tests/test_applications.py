@@ -0,0 +1,135 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cmlbootstrap.applications import ApplicationManager
+
+
+class FakeCML:
+    host = "https://ml.example.com"
+
+    def __init__(self, delete_error=None, create_errors=0):
+        self.apps = {
+            1: {"id": 1, "name": "app", "subdomain": "app", "script": "app.py",
+                "runtimeId": 10, "status": "running"},
+        }
+        self.delete_error = delete_error
+        self.create_errors = create_errors
+        self.created = []
+        self.next_id = 100
+
+    def get_applications(self):
+        return [dict(app) for app in self.apps.values()]
+
+    def get_application(self, app_id, params):
+        return dict(self.apps[int(app_id)])
+
+    def restart_application(self, app_id):
+        return dict(self.apps[app_id])
+
+    def delete_application(self, app_id, params):
+        if self.delete_error:
+            return self.delete_error
+        del self.apps[app_id]
+        return None
+
+    def create_application(self, params):
+        self.created.append(params)
+        if self.create_errors:
+            self.create_errors -= 1
+            return {"message": "subdomain taken"}
+        app = dict(params, id=self.next_id, status="running")
+        self.apps[self.next_id] = app
+        self.next_id += 1
+        return dict(app)
+
+
+def manager(cml):
+    return ApplicationManager(cml, initial_delay=0.001, max_delay=0.01, timeout=1)
+
+
+def test_restart_reports_readiness():
+    [result] = manager(FakeCML()).restart()
+    assert result["ready"] is True
+    assert result["id"] == 1
+    assert result["latency"] >= 0
+
+
+def test_plan_lists_changes():
+    [plan] = manager(FakeCML()).recreate(changes={"runtimeId": 12}, dry_run=True)
+    assert plan["changes"] == {"runtimeId": [10, 12]}
+
+
+def test_recreate_applies_changes():
+    cml = FakeCML()
+    [result] = manager(cml).recreate(changes={"runtimeId": 12})
+    assert result["ready"] is True
+    assert result["id"] == 100
+    assert cml.apps[100]["runtimeId"] == 12
+    assert 1 not in cml.apps
+
+
+def test_failed_delete_does_not_create():
+    cml = FakeCML(delete_error={"message": "forbidden"})
+    [result] = manager(cml).recreate(changes={"runtimeId": 12})
+    assert result["ready"] is False
+    assert result["id"] == 1
+    assert cml.created == []
+
+
+def test_failed_create_restores_original():
+    cml = FakeCML(create_errors=1)
+    [result] = manager(cml).recreate(changes={"runtimeId": 12})
+    assert result["ready"] is False
+    assert result["restored"] is True
+    assert result["id"] == 100
+    assert cml.apps[100]["runtimeId"] == 10
+    assert result["params"]["runtimeId"] == 10
+
+
+def test_failed_restore_reports_params():
+    cml = FakeCML(create_errors=2)
+    [result] = manager(cml).recreate(changes={"runtimeId": 12})
+    assert result["restored"] is False
+    assert result["id"] is None
+    assert result["deleted_id"] == 1
+    assert result["params"] == {"name": "app", "subdomain": "app", "script": "app.py", "runtimeId": 10}
+
+
+class StubApplication(BaseHTTPRequestHandler):
+    """Serves /health and redirects every other path to a login page."""
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_response(200)
+        elif self.path == "/login":
+            self.send_response(200)
+        else:
+            self.send_response(302)
+            self.send_header("Location", "/login")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def app_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApplication)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("health_path, ready", [("/health", True), ("/private", False)])
+def test_health_probe_does_not_follow_redirects(monkeypatch, app_url, health_path, ready):
+    apps = manager(FakeCML())
+    monkeypatch.setattr(apps, "application_url", lambda app: app_url)
+    [result] = apps.restart(health_path=health_path)
+    assert result["ready"] is ready
+    if not ready:
+        assert result["error"] == "health check failed"
@@ -0,0 +1,86 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from cmlbootstrap import CMLBootstrap
+
+cml_module = sys.modules["cmlbootstrap.CMLBootstrap"]
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def json(self):
+        return {"name": "project"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def concurrent_reads(monkeypatch, n, request):
+    cml = CMLBootstrap(host="https://ml.example.com", username="user",
+                       api_key="key-{}".format(id(request)), project_name="project")
+    monkeypatch.setattr(cml._session, "request", request)
+    before = cml.coalescing_stats()
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = cml.get_project()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    after = cml.coalescing_stats()
+    delta = {key: after[key] - before[key] for key in after}
+    return results, errors, delta
+
+
+def test_concurrent_reads_share_one_request(monkeypatch):
+    sent = []
+
+    def request(*args, **kwargs):
+        sent.append(args)
+        time.sleep(0.2)
+        return FakeResponse()
+
+    results, errors, delta = concurrent_reads(monkeypatch, 10, request)
+
+    assert len(sent) == 1
+    assert errors == [None] * 10
+    assert results == [{"name": "project"}] * 10
+    assert delta == {"calls": 10, "executions": 1, "coalesced": 9}
+
+
+def test_summary_and_fields_are_exclusive():
+    cml = CMLBootstrap(host="https://ml.example.com", username="user",
+                       api_key="key", project_name="project")
+    with pytest.raises(ValueError):
+        cml.get_jobs(fields=["id"], summary=True)
+
+
+def test_request_errors_are_shared(monkeypatch):
+    sent = []
+
+    def request(*args, **kwargs):
+        sent.append(args)
+        time.sleep(0.2)
+        raise cml_module.requests.ConnectionError("down")
+
+    results, errors, delta = concurrent_reads(monkeypatch, 5, request)
+
+    assert len(sent) == 1
+    assert all(isinstance(e, cml_module.requests.ConnectionError) for e in errors)
+    assert delta == {"calls": 5, "executions": 1, "coalesced": 4}
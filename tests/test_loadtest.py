@@ -0,0 +1,94 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cmlbootstrap.loadtest import ModelLoadTest, percentile
+
+
+class StubModel(BaseHTTPRequestHandler):
+    """Answers like a CML model: success unless the access key is wrong."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+    reply = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubModel.requests.append(body)
+        if StubModel.reply is not None:
+            reply = StubModel.reply
+        else:
+            reply = {"success": body["accessKey"] == "key", "response": body["request"]}
+        out = json.dumps(reply).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    StubModel.requests = []
+    StubModel.reply = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubModel)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}/model".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile(list(range(1, 11)), 50) == 5
+    assert percentile([7], 99) == 7
+    assert percentile([], 99) is None
+
+
+def test_load_test_against_stub_model(endpoint):
+    report = ModelLoadTest(endpoint, "key", concurrency=4).run({"x": 1}, rps=50, duration=1)
+
+    assert report["requests"] == 50
+    assert len(StubModel.requests) == 50
+    assert StubModel.requests[0] == {"accessKey": "key", "request": {"x": 1}}
+    assert report["errors"] == 0
+    assert report["error_rate"] == 0.0
+    assert report["statuses"] == {200: 50}
+    latency = report["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+
+
+def test_failed_predictions_count_as_errors(endpoint):
+    report = ModelLoadTest(endpoint, "wrong", concurrency=4).run({"x": 1}, rps=20, duration=0.5)
+    assert report["requests"] == 10
+    assert report["error_rate"] == 1.0
+
+
+def test_non_dict_bodies_do_not_abort_the_run(endpoint):
+    StubModel.reply = [1, 2, 3]
+    report = ModelLoadTest(endpoint, "key", concurrency=4).run({"x": 1}, rps=20, duration=0.5)
+    assert report["requests"] == 10
+    assert report["errors"] == 0
+
+
+@pytest.mark.parametrize("rps, duration", [(0, 1), (-5, 1), (10, 0), (10, -1)])
+def test_rate_and_duration_must_be_positive(rps, duration):
+    with pytest.raises(ValueError):
+        ModelLoadTest("http://127.0.0.1:1/model", "key").run({"x": 1}, rps=rps, duration=duration)
+
+
+def test_single_worker_reports_client_saturation(endpoint):
+    report = ModelLoadTest(endpoint, "key", concurrency=1, replicas=2).run({"x": 1}, rps=20, duration=0.5)
+    assert report["client_saturated"] is True
+    assert "saturated" not in report
+    assert report["in_flight_per_replica"] == pytest.approx(report["mean_in_flight"] / 2, abs=0.01)
@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from cmlbootstrap import projection
+
+
+class FakeRaw(io.BytesIO):
+    decode_content = False
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.raw = FakeRaw(json.dumps(body).encode("utf-8"))
+
+    def json(self):
+        return json.loads(self.raw.getvalue())
+
+
+@pytest.fixture(params=["ijson", "json"])
+def parser(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(projection, "ijson", None)
+    return request.param
+
+
+def test_project_keeps_nested_fields():
+    item = {"id": 1, "name": "job", "latest": {"status": "succeeded", "log": "..."}}
+    assert projection.project(item, ("id", "latest.status")) == {"id": 1, "latest": {"status": "succeeded"}}
+
+
+def test_load_projected_top_level_list(parser):
+    body = [{"id": 1, "name": "a", "script": "x"}, {"id": 2, "name": "b"}]
+    assert projection.load_projected(FakeResponse(body), "item", ("id",)) == [{"id": 1}, {"id": 2}]
+
+
+def test_load_projected_nested_list(parser):
+    body = {"runtimes": [{"id": 1, "kernel": "Python 3.9", "description": "..."}], "total": 1}
+    assert projection.load_projected(FakeResponse(body), "runtimes.item", ("id", "kernel")) == \
+        {"runtimes": [{"id": 1, "kernel": "Python 3.9"}]}
+
+
+@pytest.mark.parametrize("body, items, expected", [
+    ({"message": "error", "jobs": [{"id": 1}]}, "item", []),
+    ([{"id": 1}], "runtimes.item", {"runtimes": []}),
+    ({"runtimes": {"id": 1}}, "runtimes.item", {"runtimes": []}),
+])
+def test_load_projected_without_list(parser, body, items, expected):
+    assert projection.load_projected(FakeResponse(body), items, ("id",)) == expected
+
+
+def test_resolve_fields():
+    assert projection.resolve_fields(None, False, ("id",)) is None
+    assert projection.resolve_fields(["name"], False, ("id",)) == ["name"]
+    assert projection.resolve_fields(None, True, ("id",)) == ("id",)
+    with pytest.raises(ValueError):
+        projection.resolve_fields(["name"], True, ("id",))
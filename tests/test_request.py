@@ -0,0 +1,122 @@
+import io
+import json
+import logging
+
+import pytest
+
+from cmlbootstrap import CMLBootstrap, enable_json_logging
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = "" if body is None else json.dumps(body)
+        self.raw = io.BytesIO(self.text.encode("utf-8"))
+        self.raw.decode_content = False
+        self.closed = False
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+@pytest.fixture
+def cml():
+    return CMLBootstrap(host="https://ml.example.com", username="user", api_key="key",
+                        project_name="project", coalesce_reads=False)
+
+
+class Sent(list):
+    """Records requests and answers them with queued responses."""
+
+    def __init__(self, monkeypatch, cml):
+        super().__init__()
+        self.monkeypatch = monkeypatch
+        self.cml = cml
+
+    def respond(self, responses):
+        def request(method, endpoint, **kwargs):
+            self.append((method, endpoint, kwargs))
+            return responses.pop(0)
+        self.monkeypatch.setattr(self.cml._session, "request", request)
+
+
+@pytest.fixture
+def sent(monkeypatch, cml):
+    return Sent(monkeypatch, cml)
+
+
+def test_requests_are_logged_with_structured_fields(cml, sent, caplog):
+    sent.respond([FakeResponse(200, {"name": "project"})])
+    with caplog.at_level(logging.DEBUG, logger="cmlbootstrap"):
+        assert cml.get_project() == {"name": "project"}
+
+    [record] = [r for r in caplog.records if r.getMessage() == "Project details retrieved"]
+    assert record.method == "GET"
+    assert record.endpoint == "https://ml.example.com/api/v1/projects/user/project"
+    assert record.status == 200
+    assert record.latency_ms >= 0
+    assert record.request_id == sent[0][2]["headers"]["X-Request-ID"]
+
+
+def test_error_payloads_are_capped(cml, sent, caplog):
+    cml.payloads.max_chars = 10
+    sent.respond([FakeResponse(500, {"message": "boom", "detail": "x" * 1000})])
+    with caplog.at_level(logging.ERROR, logger="cmlbootstrap"):
+        cml.start_job(1)
+
+    payloads = [r.getMessage() for r in caplog.records if r.getMessage().startswith("payload")]
+    assert len(payloads) == 1
+    assert len(payloads[0]) < 50
+
+
+def test_create_environment_variable_goes_through_request(cml, sent, caplog):
+    sent.respond([FakeResponse(200, {"A": "1"}), FakeResponse(204)])
+    with caplog.at_level(logging.DEBUG, logger="cmlbootstrap"):
+        assert cml.create_environment_variable({"B": "2"}) == 204
+
+    method, endpoint, kwargs = sent[1]
+    assert method == "PUT"
+    assert json.loads(kwargs["data"]) == {"A": "1", "B": "2"}
+    [record] = [r for r in caplog.records if r.getMessage() == "Environment variable created"]
+    assert record.status == 204
+
+
+def test_projected_responses_are_closed(cml, sent):
+    response = FakeResponse(200, [{"id": 1, "name": "job", "script": "x"}])
+    sent.respond([response])
+    assert cml.get_jobs(fields=["id"]) == [{"id": 1}]
+    assert sent[0][2]["stream"] is True
+    assert response.closed
+
+
+def test_clients_do_not_share_cookies():
+    alice = CMLBootstrap(host="https://ml.example.com", username="alice", api_key="alice-key",
+                         project_name="project")
+    bob = CMLBootstrap(host="https://ml.example.com", username="bob", api_key="bob-key",
+                       project_name="project")
+    alice._session.cookies.set("session", "alice", domain="ml.example.com")
+    assert alice._session is not bob._session
+    assert "session" not in bob._session.cookies
+
+
+def test_client_keeps_the_configured_log_level():
+    package_logger = logging.getLogger("cmlbootstrap")
+    level = package_logger.level
+    handler = enable_json_logging(logging.DEBUG, io.StringIO())
+    try:
+        CMLBootstrap(host="https://ml.example.com", username="user", api_key="key",
+                     project_name="project")
+        assert package_logger.level == logging.DEBUG
+        CMLBootstrap(host="https://ml.example.com", username="user", api_key="key",
+                     project_name="project", log_level=logging.WARNING)
+        assert package_logger.level == logging.WARNING
+    finally:
+        package_logger.removeHandler(handler)
+        package_logger.setLevel(level)
@@ -0,0 +1,94 @@
+import pytest
+
+from cmlbootstrap import runtimes
+from cmlbootstrap.runtimes import RuntimeCatalog
+
+RUNTIMES = [
+    {"id": 1, "kernel": "Python 3.9", "editor": "Workbench", "edition": "Standard", "shortVersion": "2021.12"},
+    {"id": 5, "kernel": "Python 3.9", "editor": "Workbench", "edition": "Standard", "shortVersion": "2022.04"},
+    {"id": 3, "kernel": "R 4.0", "editor": "Workbench", "edition": "Standard", "shortVersion": "2022.04"},
+]
+ADDONS = [
+    {"identifier": "spark311-13-hf1", "displayName": "Spark 3.1.1 - CDP 7.2.11"},
+    {"identifier": "spark243-13-hf1"},
+]
+
+
+class FakeCML:
+    host = "https://ml.example.com"
+    username = "user"
+
+    def __init__(self, project_name="project", engine=None, addons=ADDONS):
+        self.project_name = project_name
+        self.engine = engine or {"id": project_name}
+        self.addons = addons
+        self.calls = 0
+
+    def get_runtimes(self):
+        self.calls += 1
+        return {"runtimes": [dict(r) for r in RUNTIMES]}
+
+    def get_runtimes_addons(self):
+        return self.addons
+
+    def get_default_engine(self):
+        return self.engine
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(runtimes, "DEFAULT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_find_runtime_returns_newest_match():
+    catalog = RuntimeCatalog.from_cml(FakeCML())
+    assert catalog.find_runtime(kernel="python 3.9", editor="Workbench")["id"] == 5
+    assert [r["id"] for r in catalog.find_runtimes(short_version="2022.04")] == [5, 3]
+    assert catalog.find_runtime(kernel="Python 3.11") is None
+
+
+def test_spark_addons_by_version():
+    catalog = RuntimeCatalog.from_cml(FakeCML())
+    assert [a["identifier"] for a in catalog.spark_addons("3.1.1")] == ["spark311-13-hf1"]
+    assert [a["identifier"] for a in catalog.spark_addons("2.4")] == ["spark243-13-hf1"]
+
+
+def test_load_uses_cache_until_expired():
+    cml = FakeCML()
+    RuntimeCatalog.load(cml)
+    RuntimeCatalog.load(cml)
+    assert cml.calls == 1
+    RuntimeCatalog.load(cml, ttl=-1)
+    assert cml.calls == 2
+
+
+def test_cache_is_per_project():
+    first = RuntimeCatalog.load(FakeCML("first"))
+    second = RuntimeCatalog.load(FakeCML("second"))
+    assert first.default_engine == {"id": "first"}
+    assert second.default_engine == {"id": "second"}
+
+
+@pytest.mark.parametrize("cml", [
+    FakeCML(engine={"message": "forbidden"}),
+    FakeCML(addons={"message": "forbidden"}),
+])
+def test_error_responses_are_not_cached(cml, cache_dir):
+    with pytest.raises(ValueError):
+        RuntimeCatalog.load(cml)
+    assert list(cache_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize("content", ["[]", "{}", '{"runtimes": 1, "addons": [], "default_engine": null, "fetched_at": 0}',
+                                     '{"runtimes": [1], "addons": [], "default_engine": null, "fetched_at": 9e99}',
+                                     "not json"])
+def test_malformed_cache_is_fetched_again(content):
+    cml = FakeCML()
+    path = RuntimeCatalog.default_path(cml.host, cml.username, cml.project_name)
+    with open(path, "w") as f:
+        f.write(content)
+    catalog = RuntimeCatalog.load(cml)
+    assert cml.calls == 1
+    assert catalog.find_runtime(kernel="Python 3.9")["id"] == 5
+    assert RuntimeCatalog.read(path).runtimes == catalog.runtimes
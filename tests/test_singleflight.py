@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from cmlbootstrap.singleflight import SingleFlight
+
+
+def run_concurrently(n, target):
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    started = threading.Event()
+
+    def fetch():
+        started.set()
+        time.sleep(0.2)
+        return {"a": [1]}
+
+    results, errors = run_concurrently(10, lambda: group.do("key", fetch))
+
+    assert errors == [None] * 10
+    assert results == [{"a": [1]}] * 10
+    assert group.stats() == {"calls": 10, "executions": 1, "coalesced": 9}
+
+
+def test_callers_get_independent_results():
+    group = SingleFlight()
+
+    def fetch():
+        time.sleep(0.2)
+        return {"a": [1]}
+
+    def call_and_mutate():
+        result = group.do("key", fetch)
+        result["a"].append("MUTATED")
+        return result
+
+    results, errors = run_concurrently(20, call_and_mutate)
+
+    assert errors == [None] * 20
+    assert all(result == {"a": [1, "MUTATED"]} for result in results)
+    assert group.stats()["executions"] == 1
+
+
+def test_errors_are_shared():
+    group = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    results, errors = run_concurrently(5, lambda: group.do("key", fetch))
+
+    assert len(calls) == 1
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_key_is_forgotten_after_completion():
+    group = SingleFlight()
+    assert group.do("key", lambda: 1) == 1
+    assert group.do("key", lambda: 2) == 2
+    assert group.stats() == {"calls": 2, "executions": 2, "coalesced": 0}
+    with pytest.raises(KeyError):
+        group.do("key", lambda: {}["missing"])
+    assert group.do("key", lambda: 3) == 3